@@ -2,6 +2,7 @@ import logging
 import os
 import sys
 import tempfile
+import typing as t
 from pathlib import Path
 
 from i3configger import exc
@@ -36,6 +37,12 @@ def configure_logging(verbosity: int, logPath: str, isDaemon=False):
         rootLogger.addHandler(fileHandler)
 
 
+def get_stamp(path: Path) -> t.Tuple[int, int, int]:
+    """Identify a version of a file - mtime alone might be too coarse."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
 def i3configger_excepthook(type_, value, traceback):
     if DEBUG or not isinstance(value, exc.I3configgerException):
         _REAL_EXCEPTHOOK(type_, value, traceback)
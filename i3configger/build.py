@@ -1,6 +1,8 @@
 import logging
 import os
 import pprint
+import re
+import shutil
 import time
 from pathlib import Path
 from string import Template
@@ -11,6 +13,9 @@ log = logging.getLogger(__name__)
 
 
 class Builder:
+    HEADER_RE = re.compile(r'#+\n# Built\b.*\bby i3configger\b.*\n#+')
+    """Recognize a header written by make_header (in any version)"""
+
     def __init__(self, configPath):
         self.cnf = config.I3configgerConfig(configPath)
         log.info("initialized %s", self)
@@ -19,8 +24,12 @@ class Builder:
         return "%s\n%s" % (self.__class__.__name__, pprint.pformat(vars(self)))
 
     def build(self):
+        """Build and persist - return whether any file actually changed."""
+        self.changedPaths = []
         content = self._build()
         self.persist_main(content, self.cnf.mainTargetPath)
+        log.info("changed: %s", self.changedPaths)
+        return bool(self.changedPaths)
 
     def _build(self):
         prts = partials.create(self.cnf.partialsPath)
@@ -37,20 +46,31 @@ class Builder:
         return content.rstrip('\n') + '\n'
 
     def persist_main(self, content, path):
+        """Write and check next to the target, then swap it in.
+
+        The target is never missing, half written or broken.
+        """
+        headerLines = self.make_header().count('\n')
+        if self.is_unchanged(path, content, headerLines):
+            log.info("[SKIP] %s is up to date", path)
+            return
         container = path.parent
         targetName = path.name
         backupPath = container / (targetName + '.bak')
-        if self.cnf.mainTargetPath.exists():
-            os.rename(self.cnf.mainTargetPath, backupPath)
+        newPath = container / (targetName + '.new')
         try:
-            self.cnf.mainTargetPath.write_text(content)
-            if not ipc.I3.config_is_ok(self.cnf.mainTargetPath):
+            newPath.write_text(content)
+            if not ipc.I3.config_is_ok(newPath):
                 brokenPath = container / (targetName + '.broken')
-                os.rename(self.cnf.mainTargetPath, brokenPath)
+                os.replace(newPath, brokenPath)
                 raise exc.BuildError(f"{brokenPath} is broken")
-        except:
-            os.rename(backupPath, self.cnf.mainTargetPath)
-            raise
+            if path.exists():
+                shutil.copy2(path, backupPath)
+            os.replace(newPath, path)
+        finally:
+            if newPath.exists():
+                os.unlink(newPath)
+        self.changedPaths.append(path)
 
     def get_bar_content(self, prts, ctx, state):
         bars = []
@@ -69,18 +89,38 @@ class Builder:
             tpl = partials.find(prts, selectKey, barCnf["template"])
             assert isinstance(tpl, partials.Partial), tpl
             container = Path(barCnf["target"])
-            if not container.is_absolute():
-                container = (self.cnf.partialsPath / container).resolve()
-                barCnf["target"] = str(container)
             eCtx = context.enhance(ctx, [barCnf, prt, state["set"]])
             bars.append(self.substitute(tpl.display, eCtx))
             if prt.name not in alreadyWritten:
                 content = self.substitute(prt.payload, eCtx)
                 path = container / f"{prt.name}{base.SUFFIX}"
-                path.write_text(content + '\n')
+                content += '\n'
+                if not self.is_unchanged(path, content):
+                    path.write_text(content)
+                    self.changedPaths.append(path)
                 alreadyWritten.append(path)
         return '\n'.join(bars)
 
+    @classmethod
+    def is_unchanged(cls, path, content, headerLines=0):
+        """Compare with what is there already.
+
+        If headerLines are given, content starts with a header from
+        make_header, which contains the build time and is not compared.
+        The file only counts as unchanged if it has such a header, too.
+        """
+        try:
+            current = path.read_text()
+        except FileNotFoundError:
+            return False
+        if headerLines:
+            *currentHeader, current = current.split('\n', headerLines)
+            if (len(currentHeader) < headerLines or
+                    not cls.HEADER_RE.fullmatch('\n'.join(currentHeader))):
+                return False
+            content = content.split('\n', headerLines)[-1]
+        return current == content
+
     @classmethod
     def substitute(cls, content, ctx):
         """Substitute all variables with their values.
@@ -20,6 +20,8 @@ def process_command_line():
             "message and daemon/watch can't be used together. "
             "Start the watcher process first and then you can send messages"
             "in following calls.")
+    if args.poll_interval is not None and args.poll_interval <= 0:
+        parser.error("--poll-interval must be a positive number of seconds")
     if args.load_config and any([args.daemon, args.kill, args.watch]):
         parser.error(
             "Loading a configuration or state and daemon/watch can't be "
@@ -46,6 +48,10 @@ def _parse_args(p):
     # TODO automatically deactivate notify if no one will pick them up
     p.add_argument('--no-notify', action="store_true", default=False,
                    help="deactivate notification via notify-send")
+    p.add_argument('--poll-interval', action="store", type=float,
+                   default=None,
+                   help="poll for changes every n seconds instead of using "
+                        "inotify (default: only on network file systems)")
     p.add_argument('--log', action="store", default=None,
                    help="i3configgerPath to where log should be stored")
     p.add_argument('--load-config', action="store", default=None,
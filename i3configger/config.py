@@ -1,9 +1,11 @@
+import copy
+import functools
 import json
 import logging
 import pprint
 from pathlib import Path
 
-from i3configger import exc, partials, paths
+from i3configger import base, exc, partials, paths
 
 log = logging.getLogger(__name__)
 
@@ -22,6 +24,9 @@ I3_CONFIGGER_DEFAULTS = {
   }
 }
 
+_PARSE_CACHE = {}
+"""path -> (stamp, payload) of already parsed json files"""
+
 
 class I3configgerConfig:
     def __init__(self, configPath: Path, message: list=None):
@@ -34,11 +39,8 @@ class I3configgerConfig:
         self.payload = fetch(self.configPath)
         self.state = State.process(
             self.statePath, partials.create(self.partialsPath), self.message)
-        targetPath = Path(self.payload["main"]["target"]).expanduser()
-        if targetPath.is_absolute():
-            self.mainTargetPath = targetPath.resolve()
-        else:
-            self.mainTargetPath = (self.partialsPath / targetPath).resolve()
+        self.mainTargetPath = resolve_target(
+            self.payload["main"]["target"], self.partialsPath)
         self.barTargets = self.make_bar_targets(self.payload.get("bars", {}))
         log.debug("initialized config  %s", self)
 
@@ -58,6 +60,8 @@ class I3configgerConfig:
             for defaultKey, defaultValue in defaults.items():
                 if defaultKey not in newBar:
                     newBar[defaultKey] = defaultValue
+            newBar["target"] = str(
+                resolve_target(newBar["target"], self.partialsPath))
         return barTargets
 
 
@@ -121,7 +125,8 @@ class State:
     def fetch_state(cls, statePath, prts):
         if not statePath.exists():
             return cls.populate_initial_state(statePath, prts)
-        return fetch(statePath)
+        # state is altered by process - don't mess up the cached payload
+        return copy.deepcopy(fetch(statePath))
 
     @classmethod
     def populate_initial_state(cls, statePath, prts):
@@ -145,17 +150,47 @@ class State:
                                f"I only now: {[m[0] for m in cls._ALL]}")
 
 
+@functools.lru_cache(maxsize=256)
+def resolve_target(target: str, root: Path) -> Path:
+    """Resolve a target from the settings (relative ones are relative to root).
+
+    Settings and folders don't move while i3configger runs, so this is
+    only done once per target.
+    """
+    path = Path(target).expanduser()
+    if not path.is_absolute():
+        path = root / path
+    return path.resolve()
+
+
 def fetch(path):
+    """Read json from path - unchanged files are served from cache."""
     if not path.exists():
         raise exc.ConfigError(f"No config found at {path}")
+    stamp = base.get_stamp(path)
+    cached = _PARSE_CACHE.get(path)
+    if cached and cached[0] == stamp:
+        log.debug("use cached config from %s", path)
+        return cached[1]
     with path.open() as f:
         log.info("read config from %s", path)
         payload = json.load(f)
         log.debug("use:\n%s", pprint.pformat(payload))
-        return payload
+    _PARSE_CACHE[path] = (stamp, payload)
+    return payload
 
 
 def freeze(path, obj):
-    with open(path, 'w') as f:
-        json.dump(obj, f, sort_keys=True, indent=2)
+    """Write obj as json - unless it is already there.
+
+    Writing the same state again would trigger the watcher for nothing.
+    """
+    content = json.dumps(obj, sort_keys=True, indent=2)
+    try:
+        if path.read_text() == content:
+            log.debug("[SKIP] %s is up to date", path)
+            return
+    except FileNotFoundError:
+        pass
+    path.write_text(content)
     log.debug("froze %s to %s", pprint.pformat(obj), path)
@@ -1,21 +1,76 @@
+import fcntl
+import logging
 import os
+import signal
 import sys
+import tempfile
+import time
 from pathlib import Path
 
 import daemon
-import psutil
 
 from i3configger.watch import Watchman
 from i3configger.base import configure_logging
 
+log = logging.getLogger(__name__)
+
+PID_PATH = Path(tempfile.gettempdir()) / 'i3configger.pid'
+"""Locked by the watching process for as long as it lives"""
+PID_WIDTH = 10
+"""pids are written right aligned with a fixed width"""
+CLAIM_TRIES = 50
+CLAIM_DELAY = 0.01
+"""Probes hold a shared lock for a moment - wait for them that long"""
+_pidFile = None
+
 
 def get_other_i3configgers():
-    """should always be max one, but you never know ..."""
-    others = [p for p in psutil.process_iter() if p.name() == 'i3configger']
-    return [p for p in others if p.pid != os.getpid()]
+    """Pid of the watching process (if there is one and it is not me)."""
+    try:
+        fd = os.open(PID_PATH, os.O_RDONLY)
+    except FileNotFoundError:
+        return []
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        return []
+    except BlockingIOError:
+        try:
+            pid = int(os.read(fd, 32))
+        except ValueError:
+            log.warning("[IGNORE] garbage in %s", PID_PATH)
+            return []
+        return [pid] if pid != os.getpid() else []
+    finally:
+        os.close(fd)
+
+
+def claim_pid_file():
+    """Lock the pid file and write my pid into it, if nobody else did."""
+    global _pidFile
+    fd = os.open(PID_PATH, os.O_CREAT | os.O_RDWR, 0o644)
+    for _ in range(CLAIM_TRIES):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            break
+        except BlockingIOError:
+            # might be another call probing for a watcher right now
+            others = get_other_i3configgers()
+            if others:
+                os.close(fd)
+                sys.exit("i3configger already running (%s)" % others)
+            time.sleep(CLAIM_DELAY)
+    else:
+        os.close(fd)
+        sys.exit(f"can't lock {PID_PATH} - is i3configger running?")
+    # overwrite in one go instead of truncating first: readers never see
+    # an empty file and the fixed width leaves no digits of an older pid
+    pid = ('%*d' % (PID_WIDTH, os.getpid())).encode()
+    os.pwrite(fd, pid, 0)
+    os.ftruncate(fd, len(pid))
+    _pidFile = fd
 
 
-def daemonize(verbosity, logPath, cnf):
+def daemonize(verbosity, logPath, cnf, pollInterval=None):
     others = get_other_i3configgers()
     if others:
         sys.exit("i3configger already running (%s)" % others)
@@ -33,12 +88,14 @@ def daemonize(verbosity, logPath, cnf):
         context.stdout = sys.stdout
         context.stderr = sys.stderr
     with context:
+        # lock after forking - the lock belongs to the daemon process
+        claim_pid_file()
         configure_logging(verbosity, logPath, isDaemon=True)
-        Watchman(cnf).watch_guarded()
+        Watchman(cnf, pollInterval).watch_guarded()
 
 
 def exorcise():
     # todo some error handling
-    for process in get_other_i3configgers():
-        print("killing %s" % process.pid)
-        process.kill()
+    for pid in get_other_i3configgers():
+        print("killing %s" % pid)
+        os.kill(pid, signal.SIGTERM)
@@ -1,3 +1,7 @@
+import json
+import os
+import socket
+import struct
 import subprocess
 
 from i3configger.base import log
@@ -5,6 +9,14 @@ from i3configger.base import log
 
 # todo use Adaephons i3 library
 class I3:
+    MAGIC = b'i3-ipc'
+    HEADER = struct.Struct('=%dsII' % len(MAGIC))
+    """magic string, payload length, message type"""
+    RUN_COMMAND = 0
+    TIMEOUT = 2
+    _socket = None
+    """connection to i3 - kept open over builds"""
+
     @classmethod
     def set_msg_type(cls, which):
         cls.refresh = {
@@ -18,7 +30,7 @@ class I3:
 
     @classmethod
     def restart_i3(cls):
-        subprocess.call(['i3-msg', 'restart'])
+        cls._send_i3_msg('restart')
 
     @classmethod
     def nop(cls):
@@ -28,6 +40,77 @@ class I3:
 
     @classmethod
     def _send_i3_msg(cls, msg):
+        """Send a command over the i3 ipc socket.
+
+        Falls back to i3-msg only if the command could not be sent. Once
+        it is sent, i3 got it - sending it again would run it twice.
+
+        https://i3wm.org/docs/ipc.html
+        """
+        try:
+            sock = cls._get_socket()
+            payload = msg.encode()
+            sock.sendall(
+                cls.HEADER.pack(cls.MAGIC, len(payload), cls.RUN_COMMAND) +
+                payload)
+        except (OSError, subprocess.CalledProcessError) as e:
+            log.warning("[IGNORE] ipc failed (%s) - falling back to i3-msg", e)
+            cls._disconnect()
+            return cls._send_i3_msg_via_i3_msg(msg)
+        if msg == 'restart':
+            log.debug("i3 drops all connections on restart without reply")
+            cls._disconnect()
+            return True
+        try:
+            return cls._receive_reply(sock)
+        except (OSError, ValueError) as e:
+            log.warning("[IGNORE] no proper reply from i3 (%s)", e)
+            cls._disconnect()
+            return False
+
+    @classmethod
+    def _receive_reply(cls, sock):
+        magic, length, _ = cls.HEADER.unpack(
+            cls._receive(sock, cls.HEADER.size))
+        if magic != cls.MAGIC:
+            raise ValueError(f"unexpected reply from i3: {magic}")
+        replies = json.loads(cls._receive(sock, length).decode())
+        return all(reply.get('success') for reply in replies)
+
+    @classmethod
+    def _get_socket(cls):
+        if not cls._socket:
+            path = os.getenv('I3SOCK') or subprocess.check_output(
+                ['i3', '--get-socketpath']).decode().strip()
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(cls.TIMEOUT)
+            try:
+                sock.connect(path)
+            except OSError:
+                sock.close()
+                raise
+            log.debug("connected to i3 at %s", path)
+            cls._socket = sock
+        return cls._socket
+
+    @staticmethod
+    def _receive(sock, size):
+        data = b''
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("i3 closed the connection")
+            data += chunk
+        return data
+
+    @classmethod
+    def _disconnect(cls):
+        if cls._socket:
+            cls._socket.close()
+            cls._socket = None
+
+    @classmethod
+    def _send_i3_msg_via_i3_msg(cls, msg):
         cmd = ['i3-msg', msg]
         try:
             output = subprocess.check_output(cmd).decode()
@@ -28,11 +28,13 @@ def main():
     log.info("set i3 refresh method to %s", ipc.I3.refresh)
     ipc.Notify.set_notify_command(args.no_notify)
     if args.daemon:
-        daemonize.daemonize(args.v, args.log, configPath)
+        daemonize.daemonize(
+            args.v, args.log, configPath, args.poll_interval)
         return 0
     if args.watch:
+        daemonize.claim_pid_file()
         try:
-            watch.Watchman(configPath).watch()
+            watch.Watchman(configPath, args.poll_interval).watch()
         except KeyboardInterrupt:
             sys.exit("bye")
     if args.load_config:
@@ -41,7 +43,9 @@ def main():
             Path(args.load).expanduser(), partials.create(p.root))
         config.freeze(configPath, state)
     else:
-        build.Builder(configPath).build()
+        if not build.Builder(configPath).build():
+            log.info("nothing changed")
+            return 0
         ipc.I3.refresh()
         ipc.StatusBar.refresh()
         ipc.Notify.send('new config active')
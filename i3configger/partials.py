@@ -1,4 +1,5 @@
 import logging
+import os
 import pprint
 import re
 import socket
@@ -14,12 +15,28 @@ SPECIAL_SELECTORS = {
     "hostname": socket.gethostname()
 }
 
+_CREATED = {}
+"""partials path -> (stamp, partials) to reuse listing and instances"""
+
 
 @total_ordering
 class Partial:
-    CONTINUATION_RE = re.compile(r'\\\s*?\\s*?\n')
     COMMENT_MARK = '#'
+    CONTINUATION_RE = re.compile(
+        r'(?m)^(?![^\S\n]*%s)(.*)\\\n' % COMMENT_MARK)
+    """Backslash right before the newline - comments are not continued."""
     END_OF_LINE_COMMENT_MARK = ' # '
+    EMPTY_OR_COMMENT_LINE_RE = re.compile(
+        r'(?m)^[^\S\n]*(?:%s.*)?(?:\n|\Z)' % COMMENT_MARK)
+    EMPTY_COMMENT_OR_SET_LINE_RE = re.compile(
+        r'(?m)^[^\S\n]*(?:(?:%s|%s).*)?(?:\n|\Z)' %
+        (COMMENT_MARK, base.SET_MARK))
+    END_OF_LINE_COMMENT_RE = re.compile(
+        r'(?m)^(.*)%s.*$' % END_OF_LINE_COMMENT_MARK)
+    """Greedy: only the last end of line comment mark counts."""
+
+    __slots__ = ('path', 'name', 'selectors', 'needsSelection', 'key',
+                 'value', 'filtered', 'payload', 'display', '_stamp')
 
     def __init__(self, path: Path):
         self.path = path
@@ -28,6 +45,8 @@ class Partial:
         self.needsSelection = len(self.selectors) > 1
         self.key = self.selectors[0] if self.needsSelection else None
         self.value = self.selectors[1] if self.needsSelection else None
+        self._stamp = None
+        self.refresh()
 
     def __repr__(self):
         return "%s(%s)" % (self.__class__.__name__, self.path.name)
@@ -37,84 +56,74 @@ class Partial:
     def __lt__(self, other):
         return self.name < other.name
 
-    @property
-    def display(self) -> str:
-        if not self.filtered:
-            return ""
-        return "### %s ###\n%s\n\n" % (self.path.name, self.filtered)
-
-    @property
-    def filtered(self) -> str:
-        filtered = []
-        for line in self._joined.splitlines():
-            l = line.strip()
-            if not l:
-                continue
-            if (not l.startswith(base.SET_MARK)
-                    and not l.startswith(self.COMMENT_MARK)):
-                filtered.append(line)
-        return '\n'.join(filtered)
-
-    @property
-    def payload(self) -> str:
-        """Strip empty lines, comment lines, and end of line comments."""
-        prunes = []
-        for line in self._joined.splitlines():
-            l = line.strip()
-            if not l:
-                continue
-            if l.startswith(self.COMMENT_MARK):
-                continue
-            line = line.rsplit(self.END_OF_LINE_COMMENT_MARK, maxsplit=1)[0]
-            prunes.append(line)
-        return '\n'.join(prunes)
-
-    # FIXME I think this does not do anything
-    @property
-    def _joined(self) -> str:
-        """Join line continuations.
-
-        https://i3wm.org/docs/userguide.html#line_continuation"""
-        return re.sub(self.CONTINUATION_RE, ' ', self._raw)
-
-    @property
-    def _raw(self) -> str:
-        return self.path.read_text()
-
-
-def find(prts: t.List[Partial], key: str, value: str= None) \
+    def refresh(self):
+        """(Re)read the file if it changed and derive the content from it.
+
+        * filtered: without empty lines, comment lines, and settings
+        * payload: without empty lines, comment lines, end of line comments
+        * display: filtered with a header (empty if nothing is left)
+
+        Line continuations are joined before that:
+        https://i3wm.org/docs/userguide.html#line_continuation
+        """
+        stamp = base.get_stamp(self.path)
+        if stamp == self._stamp:
+            return
+        log.debug("read %s", self.path)
+        joined = self.CONTINUATION_RE.sub(r'\1 ', self.path.read_text())
+        self.filtered = self.EMPTY_COMMENT_OR_SET_LINE_RE.sub(
+            '', joined).rstrip('\n')
+        pruned = self.EMPTY_OR_COMMENT_LINE_RE.sub('', joined)
+        self.payload = self.END_OF_LINE_COMMENT_RE.sub(
+            r'\1', pruned).rstrip('\n')
+        self.display = (
+            "### %s ###\n%s\n\n" % (self.path.name, self.filtered)
+            if self.filtered else "")
+        self._stamp = stamp
+
+
+class Partials(list):
+    """Sorted partials with lookup tables for finding and selecting."""
+
+    def __init__(self, prts: t.Iterable[Partial]):
+        super().__init__(sorted(prts))
+        self.unconditional = []
+        self.byKey = {}
+        self.byKeyValue = {}
+        for prt in self:
+            self.byKeyValue.setdefault((prt.key, prt.value), prt)
+            if prt.needsSelection:
+                self.byKey.setdefault(prt.key, []).append(prt)
+            else:
+                self.unconditional.append(prt)
+
+
+def find(prts: t.Iterable[Partial], key: str, value: str = None) \
         -> t.Union[Partial, t.List[Partial]]:
-    findings = []
-    for prt in prts:
-        if prt.key != key:
-            continue
-        if prt.value == value:
-            return prt
-        elif not value:
-            findings.append(prt)
-    return findings
-
+    if not isinstance(prts, Partials):
+        prts = Partials(prts)
+    prt = prts.byKeyValue.get((key, value))
+    if prt:
+        return prt
+    return [] if value else list(prts.byKey.get(key, []))
 
-def select(partials, selection, excludes=None) -> t.List[Partial]:
-    def _select():
-        selected.append(partial)
-        if partial.needsSelection:
-            del selection[partial.key]
 
+def select(prts, selection, excludes=None) -> t.List[Partial]:
+    if not isinstance(prts, Partials):
+        prts = Partials(prts)
     for key, value in SPECIAL_SELECTORS.items():
         if key not in selection:
             selection[key] = value
-    selected = []
-    for partial in partials:
-        if partial.needsSelection:
-            if excludes and partial.key in excludes:
-                log.debug("[IGNORE] %s (in %s)", partial, excludes)
-                continue
-            if (selection and partial.key in selection and
-                    partial.value == selection.get(partial.key)):
-                _select()
-        else:
-            _select()
+    selected = list(prts.unconditional)
+    for key, value in list(selection.items()):
+        if excludes and key in excludes:
+            log.debug("[IGNORE] %s (in %s)", key, excludes)
+            continue
+        prt = prts.byKeyValue.get((key, value))
+        if prt and prt.needsSelection:
+            selected.append(prt)
+            del selection[key]
+    selected.sort()
     log.debug("selected:\n%s", pprint.pformat(selected))
     if selection and not all(k in SPECIAL_SELECTORS for k in selection):
         raise exc.ConfigError(
@@ -122,9 +131,27 @@ def select(partials, selection, excludes=None) -> t.List[Partial]:
     return selected
 
 
-def create(partialsPath: Path) -> t.List[Partial]:
+def create(partialsPath: Path) -> Partials:
+    """Create partials from folder - reused as long as the folder is unchanged.
+
+    Instances are kept over changes of the folder as well and only reread
+    their file if it changed.
+    """
     assert partialsPath.is_dir(), partialsPath
-    prts = [Partial(p) for p in partialsPath.glob('*%s' % base.SUFFIX)]
+    stamp = base.get_stamp(partialsPath)
+    cached = _CREATED.get(partialsPath)
+    if cached and cached[0] == stamp:
+        prts = cached[1]
+    else:
+        known = {str(prt.path): prt for prt in cached[1]} if cached else {}
+        with os.scandir(partialsPath) as entries:
+            prts = Partials(
+                known.get(e.path) or Partial(Path(e.path))
+                for e in entries
+                if e.name.endswith(base.SUFFIX) and e.is_file())
+        _CREATED[partialsPath] = (stamp, prts)
+    for prt in prts:
+        prt.refresh()
     if not prts:
         raise exc.PartialsError(f"no '*{base.SUFFIX}' at {partialsPath}")
-    return sorted(prts)
+    return prts
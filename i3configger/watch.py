@@ -1,4 +1,6 @@
+import collections
 import logging
+import os
 import pprint
 import time
 from pathlib import Path
@@ -6,32 +8,50 @@ from pathlib import Path
 from inotify import constants as ic
 from inotify.adapters import Inotify
 
-from i3configger import base, build, ipc
+from i3configger import base, build, exc, ipc
 
 log = logging.getLogger(__name__)
 
+MOUNTS_PATH = '/proc/mounts'
+NETWORK_FILESYSTEMS = ('nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', '9p', 'fuse')
+"""inotify does not (reliably) see changes on those"""
+
 
 class Watchman:
     BUILD_DELAY = 0.1
     """If an IDE does monkey business (e.g. Jetbrains "safe write")
     more than one change might be triggered for each change.
 
-    Using a small delay to not trigger to often.
+    Events are collected until nothing happened for this many seconds and
+    then result in one build per batch.
     """
 
     """Watch a config directories and build/refresh/notify on changes"""
     MASK = (
-        ic.IN_CREATE | ic.IN_ATTRIB | ic.IN_DELETE |
-        ic.IN_MODIFY | ic.IN_CLOSE_WRITE |
+        ic.IN_CREATE | ic.IN_CLOSE_WRITE | ic.IN_DELETE |
         ic.IN_MOVED_FROM | ic.IN_MOVED_TO |
         ic.IN_DELETE_SELF | ic.IN_MOVE_SELF)
-    """Tell inotify to trigger on changes"""
+    """Tell inotify to trigger on changes
+
+    Only creations, finished writes, moves and deletions are of interest.
+    IN_MODIFY fires for every chunk written and IN_ATTRIB for every touch
+    or chmod. IN_CREATE is needed for links (ln [-s]), which are not
+    written; for new regular files it ends up in the same batch as their
+    IN_CLOSE_WRITE.
+
+    The directory is watched instead of single files, as editors doing a
+    "safe write" replace the file and would kill a watch on the file itself.
+    """
+
+    SUFFIXES = (base.SUFFIX.encode(), b'.json')
+    """Changes to files with these suffixes trigger a build"""
 
-    def __init__(self, configPath):
+    def __init__(self, configPath, pollInterval=None):
         self.partialsPath = str(configPath.parent).encode()
         self.configPath = configPath
+        self.pollInterval = pollInterval
         self.lastBuild = None
-        self.lastFilePath = None
+        self.lastFilePaths = None
         self.errors = 0
         log.debug("initialized %s", self)
 
@@ -40,13 +60,13 @@ class Watchman:
             self.__class__.__name__, pprint.pformat(self.__dict__))
 
     def watch(self):
-        for event in self._get_events():
-            self._process_event(event)
+        for filenames in self._get_event_batches():
+            self._process_events(filenames)
 
     def watch_guarded(self):
-        for event in self._get_events():
+        for filenames in self._get_event_batches():
             try:
-                self._process_event(event)
+                self._process_events(filenames)
             except:
                 log.exception("I see dead calls ...")
                 self.errors += 1
@@ -54,38 +74,132 @@ class Watchman:
                     log.critical("%s errors occurred, crashing", self.errors)
                     raise RuntimeError("%s: giving up" % self)
 
-    def _get_events(self):
-        inotify_watcher = Inotify()
-        inotify_watcher.add_watch(self.partialsPath, mask=self.MASK)
-        for event in inotify_watcher.event_gen():
-            if not event:
-                continue
-            yield event
-
-    def _process_event(self, event):
-        header, typeNames, filePath = self._get_event_data(event)
-        if self.needs_build(header, typeNames, filePath):
-            log.info("%s triggered build", filePath)
-            build.Builder(self.configPath).build()
-            self.lastBuild = time.time()
-            self.lastFilePath = filePath
-            ipc.I3.refresh()
-            ipc.StatusBar.refresh()
-            ipc.Notify.send('Watchman: new config active')
-
-    @staticmethod
-    def _get_event_data(event):
-        header, typeNames, watchPath, filename = event
-        filePath = Path(watchPath.decode()) / filename.decode()
-        log.debug("wd=%d|mask=%d|mask->names=%s|filePath=[%s]",
-                  header.wd, header.mask, typeNames, filePath)
-        return header, typeNames, filePath
+    def _get_event_batches(self):
+        """Yield names of relevant files that changed in a burst of events.
+
+        A burst ends when no relevant event came in for BUILD_DELAY seconds.
+        Irrelevant events are dropped right away and don't start a batch.
+        """
+        filenames = set()
+        lastEvent = None
+        for event in self._get_watcher().event_gen():
+            if event:
+                header, typeNames, watchPath, filename = event
+                if self.needs_build(header, typeNames, filename):
+                    filenames.add(filename)
+                    lastEvent = time.monotonic()
+            elif (filenames and
+                  time.monotonic() - lastEvent >= self.BUILD_DELAY):
+                yield filenames
+                filenames = set()
+
+    def _process_events(self, filenames):
+        filePaths = sorted(
+            Path(self.partialsPath.decode()) / f.decode() for f in filenames)
+        log.info("%s triggered build", filePaths)
+        changed = build.Builder(self.configPath).build()
+        self.lastBuild = time.time()
+        self.lastFilePaths = filePaths
+        if not changed:
+            return
+        ipc.I3.refresh()
+        ipc.StatusBar.refresh()
+        ipc.Notify.send('Watchman: new config active')
+
+    def _get_watcher(self):
+        pollInterval = self.pollInterval
+        if pollInterval is None and is_on_network_fs(self.configPath.parent):
+            pollInterval = PollWatcher.DEFAULT_INTERVAL
+        if pollInterval is not None:
+            log.info("poll %s every %ss", self.partialsPath, pollInterval)
+            return PollWatcher(
+                self.partialsPath, pollInterval, self.BUILD_DELAY)
+        watcher = Inotify(block_duration_s=self.BUILD_DELAY)
+        watcher.add_watch(self.partialsPath, mask=self.MASK)
+        return watcher
 
     # noinspection PyUnusedLocal
-    def needs_build(self, header, typeNames, filePath):
-        if self.lastBuild and time.time() - self.lastBuild < self.BUILD_DELAY:
-            log.debug("ignore %s changed too quick", filePath)
-            return False
-        if filePath.suffix not in [base.SUFFIX, '.json']:
-            return False
-        return True
+    def needs_build(self, header, typeNames, filename):
+        """Check raw event data - without decoding or creating paths."""
+        log.debug("wd=%d|mask=%d|mask->names=%s|filename=%s",
+                  header.wd, header.mask, typeNames, filename)
+        return filename.endswith(self.SUFFIXES)
+
+
+PollHeader = collections.namedtuple('PollHeader', 'wd mask cookie len')
+
+
+class PollWatcher:
+    """Stat the files of a directory regularly instead of using inotify.
+
+    Yields the same events (and None every tick while waiting) as
+    ``inotify.adapters.Inotify.event_gen`` so the Watchman can't tell.
+    """
+    DEFAULT_INTERVAL = 1
+
+    def __init__(self, path: bytes, interval: float, tick: float = None):
+        if interval <= 0:
+            raise exc.ConfigError(
+                f"poll interval must be positive (got {interval})")
+        self.path = path
+        self.interval = interval
+        self.tick = min(tick or interval, interval)
+        """Pass the Watchman's BUILD_DELAY to not hold back its batches"""
+        self.stamps = self._scan()
+
+    def event_gen(self):
+        nextScan = time.monotonic() + self.interval
+        while True:
+            time.sleep(max(0, min(self.tick, nextScan - time.monotonic())))
+            if time.monotonic() >= nextScan:
+                yield from self._get_changes()
+                nextScan += self.interval
+            yield None
+
+    def _get_changes(self):
+        stamps = self._scan()
+        for name, stamp in stamps.items():
+            if self.stamps.get(name) != stamp:
+                yield self._make_event('IN_CLOSE_WRITE', name)
+        for name in self.stamps.keys() - stamps.keys():
+            yield self._make_event('IN_DELETE', name)
+        self.stamps = stamps
+
+    def _scan(self):
+        """Map names to (mtime, size, inode) - mtime alone may be coarse."""
+        stamps = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    log.debug("[IGNORE] %s vanished while scanning", entry)
+                    continue
+                stamps[entry.name] = (
+                    stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        return stamps
+
+    def _make_event(self, typeName, name):
+        header = PollHeader(-1, getattr(ic, typeName), 0, len(name))
+        return header, [typeName], self.path, name
+
+
+def is_on_network_fs(path: Path) -> bool:
+    """Find the mount point of path in MOUNTS_PATH and check its type."""
+    path = str(path.resolve())
+    mountPoint, fsType = '', ''
+    try:
+        with open(MOUNTS_PATH) as f:
+            for line in f:
+                _, mp, fst, *_ = line.split()
+                mp = mp.replace('\\040', ' ')
+                if (len(mp) > len(mountPoint) and
+                        (path == mp or path.startswith(mp.rstrip('/') + '/'))):
+                    mountPoint, fsType = mp, fst
+    except OSError:
+        log.warning("[IGNORE] can't read %s - assume local fs", MOUNTS_PATH)
+        return False
+    log.debug("%s is mounted at %s (%s)", path, mountPoint, fsType)
+    return fsType.split('.')[0] in NETWORK_FILESYSTEMS
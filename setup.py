@@ -19,7 +19,7 @@ kwargs = dict(
     use_scm_version=True,
     setup_requires=['setuptools_scm'],
     entry_points={'console_scripts': ['i3configger = i3configger.main:main']},
-    install_requires=['inotify', 'psutil', 'python-daemon'],
+    install_requires=['inotify', 'python-daemon'],
     packages=find_packages(),
     classifiers=[
         'Development Status :: 4 - Beta',
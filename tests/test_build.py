@@ -44,3 +44,40 @@ def test_build(container, monkeypatch):
         result = resultFilePath.read_text()
         reference = referenceFilePath.read_text()
         assert result == reference
+
+
+def test_build_unchanged(monkeypatch):
+    ipc.Notify.set_notify_command(True)
+    ipc.I3.config_is_ok = lambda x: True
+    monkeypatch.setattr(
+        paths, 'get_i3_config_path', lambda: EXAMPLES / '2-bars')
+    monkeypatch.setattr(build.Builder, 'make_header', lambda _: FAKE_HEADER)
+    configPath = paths.get_my_config_path()
+    build.Builder(configPath).build()
+    assert not build.Builder(configPath).build()
+    targetPath = configPath.parents[1] / 'config'
+    _, body = targetPath.read_text().split('\n', 1)
+    targetPath.write_text('# edited by hand\n' + body)
+    assert build.Builder(configPath).build()
+    assert targetPath.read_text().startswith('####')
+
+
+def test_no_leftovers_if_check_fails(monkeypatch):
+    def i3_not_installed(path):
+        raise FileNotFoundError('i3')
+
+    ipc.Notify.set_notify_command(True)
+    monkeypatch.setattr(ipc.I3, 'config_is_ok', i3_not_installed)
+    monkeypatch.setattr(
+        paths, 'get_i3_config_path', lambda: EXAMPLES / '0-default')
+    configPath = paths.get_my_config_path()
+    targetPath = configPath.parents[1] / 'config'
+    original = targetPath.read_text()
+    targetPath.write_text(original + '# changed\n')
+    try:
+        with pytest.raises(FileNotFoundError):
+            build.Builder(configPath).build()
+        assert not (configPath.parents[1] / 'config.new').exists()
+        assert targetPath.read_text() == original + '# changed\n'
+    finally:
+        targetPath.write_text(original)
@@ -1,8 +1,9 @@
 import json
+import os
 from pathlib import Path
 
 import i3configger.paths
-from i3configger import paths
+from i3configger import config, paths
 
 
 def test_no_config(tmpdir, monkeypatch):
@@ -16,3 +17,34 @@ def test_no_config(tmpdir, monkeypatch):
     assert 'main' in payload
     assert 'bars' in payload
     assert 'targets' in payload['bars']
+
+
+def test_fetch_uses_cache_until_file_changes(tmpdir):
+    path = Path(tmpdir) / 'some.json'
+    config.freeze(path, {'some': 'value'})
+    payload = config.fetch(path)
+    assert config.fetch(path) is payload
+    config.freeze(path, {'some': 'other value'})
+    assert config.fetch(path) == {'some': 'other value'}
+
+
+def test_fetch_notices_same_size_replacement_in_same_tick(tmpdir):
+    path = Path(tmpdir) / 'some.json'
+    config.freeze(path, {'some': 'value1'})
+    os.utime(path, ns=(0, 0))
+    assert config.fetch(path) == {'some': 'value1'}
+    newPath = Path(tmpdir) / 'some.json.new'
+    config.freeze(newPath, {'some': 'value2'})
+    os.utime(newPath, ns=(0, 0))
+    os.replace(newPath, path)
+    assert config.fetch(path) == {'some': 'value2'}
+
+
+def test_freeze_does_not_rewrite_unchanged(tmpdir):
+    path = Path(tmpdir) / 'some.json'
+    config.freeze(path, {'some': 'value'})
+    os.utime(path, ns=(0, 0))
+    config.freeze(path, {'some': 'value'})
+    assert path.stat().st_mtime_ns == 0
+    config.freeze(path, {'some': 'other value'})
+    assert path.stat().st_mtime_ns != 0
@@ -0,0 +1,61 @@
+import fcntl
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from i3configger import daemonize
+
+HOLD_LOCK = """\
+import time
+from i3configger import daemonize
+daemonize.claim_pid_file()
+print('locked', flush=True)
+time.sleep(30)
+"""
+
+
+def test_no_pid_file(tmpdir, monkeypatch):
+    pidPath = Path(tmpdir) / 'i3configger.pid'
+    monkeypatch.setattr(daemonize, 'PID_PATH', pidPath)
+    assert daemonize.get_other_i3configgers() == []
+
+
+def test_unlocked_pid_file_is_stale(tmpdir, monkeypatch):
+    pidPath = Path(tmpdir) / 'i3configger.pid'
+    pidPath.write_text('12345')
+    monkeypatch.setattr(daemonize, 'PID_PATH', pidPath)
+    assert daemonize.get_other_i3configgers() == []
+
+
+def test_pid_of_lock_holder(tmpdir, monkeypatch):
+    pidPath = Path(tmpdir) / 'i3configger.pid'
+    pidPath.write_text('some garbage that is longer than a pid')
+    monkeypatch.setattr(daemonize, 'PID_PATH', pidPath)
+    child = subprocess.Popen(
+        [sys.executable, '-c', HOLD_LOCK], stdout=subprocess.PIPE,
+        env=dict(os.environ, TMPDIR=str(tmpdir)))
+    try:
+        assert child.stdout.readline() == b'locked\n'
+        assert daemonize.get_other_i3configgers() == [child.pid]
+        daemonize.exorcise()
+        assert child.wait(timeout=5) != 0
+        assert daemonize.get_other_i3configgers() == []
+    finally:
+        child.kill()
+
+
+def test_claim_waits_for_probe(tmpdir, monkeypatch):
+    pidPath = Path(tmpdir) / 'i3configger.pid'
+    pidPath.write_text('12345')
+    monkeypatch.setattr(daemonize, 'PID_PATH', pidPath)
+    monkeypatch.setattr(daemonize, '_pidFile', None)
+    probe = os.open(pidPath, os.O_RDONLY)
+    fcntl.flock(probe, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    threading.Timer(0.05, os.close, [probe]).start()
+    daemonize.claim_pid_file()
+    try:
+        assert int(pidPath.read_text()) == os.getpid()
+    finally:
+        os.close(daemonize._pidFile)
@@ -0,0 +1,45 @@
+import json
+import socket
+import struct
+
+import pytest
+
+from i3configger import ipc
+
+
+@pytest.fixture
+def i3(monkeypatch):
+    """Other end of a connection the I3 class thinks is the i3 socket."""
+    mine, theirs = socket.socketpair()
+    monkeypatch.setattr(ipc.I3, '_socket', mine)
+
+    def no_fallback(msg):
+        raise AssertionError(f"fell back to i3-msg for {msg}")
+
+    monkeypatch.setattr(ipc.I3, '_send_i3_msg_via_i3_msg', no_fallback)
+    yield theirs
+    theirs.close()
+    ipc.I3._disconnect()
+
+
+def reply(payload):
+    data = json.dumps(payload).encode()
+    return b'i3-ipc' + struct.pack('=II', len(data), 0) + data
+
+
+def test_run_command_frame(i3):
+    i3.sendall(reply([{"success": True}]))
+    assert ipc.I3._send_i3_msg('reload')
+    assert i3.recv(100) == (
+        b'i3-ipc' + struct.pack('=II', len(b'reload'), 0) + b'reload')
+
+
+def test_failed_command(i3):
+    i3.sendall(reply([{"success": False}]))
+    assert not ipc.I3._send_i3_msg('reload')
+
+
+def test_no_fallback_after_sending(i3):
+    i3.sendall(b'garbage-that-is-no-reply')
+    assert not ipc.I3._send_i3_msg('reload')
+    assert ipc.I3._socket is None
@@ -40,3 +40,52 @@ def test_select_non_existing(key, value, exp):
         assert selected[0] == found
         assert selected[0].key == key
         assert selected[0].value == value
+
+
+def test_partial_is_reread_on_change(tmpdir):
+    path = Path(tmpdir) / 'some-partial.conf'
+    path.write_text('set $someVar someValue\n# some comment\n')
+    prt = partials.create(Path(tmpdir))[0]
+    payload = prt.payload
+    assert payload == 'set $someVar someValue'
+    assert prt.payload is payload
+    path.write_text('set $someVar otherValue\n')
+    assert partials.create(Path(tmpdir))[0].payload == (
+        'set $someVar otherValue')
+
+
+def test_filtered_and_payload(tmpdir):
+    path = Path(tmpdir) / 'some-partial.conf'
+    path.write_text(
+        '# some comment\n\n'
+        'set $someVar someValue # some end of line comment\n'
+        '  \n'
+        'bindsym $mod+x \\\n'
+        '    exec some-command # some end of line comment\n')
+    prt = partials.Partial(path)
+    assert prt.filtered == (
+        'bindsym $mod+x      exec some-command # some end of line comment')
+    assert prt.payload == (
+        'set $someVar someValue\n'
+        'bindsym $mod+x      exec some-command')
+
+
+def test_find_all_values_of_key():
+    prts = partials.create(SCHEMES)
+    found = partials.find(prts, 'some-category')
+    assert [p.value for p in found] == ['value1', 'value2']
+    assert partials.find(prts, 'some-category', 'none-existing-value') == []
+
+
+def test_no_continuation_of_comments(tmpdir):
+    path = Path(tmpdir) / 'some-partial.conf'
+    path.write_text(
+        '# share is \\\\server\\\n'
+        'set $someVar someValue\n'
+        'bindsym $mod+x exec some-command \\ \n'
+        'bindsym $mod+y exec other-command\n')
+    prt = partials.Partial(path)
+    assert prt.payload == (
+        'set $someVar someValue\n'
+        'bindsym $mod+x exec some-command \\ \n'
+        'bindsym $mod+y exec other-command')
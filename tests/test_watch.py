@@ -0,0 +1,150 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from i3configger import exc, watch
+
+
+class FakeHeader:
+    wd = 1
+    mask = 8
+
+
+def make_event(filename):
+    return FakeHeader(), ['IN_CLOSE_WRITE'], b'/some/path', filename
+
+
+def test_burst_of_events_is_one_batch(monkeypatch):
+    now = [0]
+    ticks = [
+        (0.00, make_event(b'some.conf')), (0.01, None),
+        (0.02, make_event(b'some.conf')), (0.03, None),
+        (0.04, make_event(b'other.conf')), (0.05, None),
+        (0.06, make_event(b'some.txt')), (0.07, None),
+        (0.15, None),
+        (1.00, None),
+    ]
+
+    class FakeWatcher:
+        @staticmethod
+        def event_gen():
+            for now[0], event in ticks:
+                yield event
+
+    monkeypatch.setattr(watch.time, 'monotonic', lambda: now[0])
+    watchman = watch.Watchman(Path('/some/path/i3configger.json'))
+    monkeypatch.setattr(watchman, '_get_watcher', lambda: FakeWatcher)
+    batches = list(watchman._get_event_batches())
+    assert batches == [{b'some.conf', b'other.conf'}]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time that only passes when sleeping."""
+    now = [0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(watch.time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(watch.time, 'sleep', sleep)
+    return now
+
+
+def test_poll_watcher(tmpdir, clock):
+    path = Path(tmpdir)
+    (path / 'some.conf').write_text('some content')
+    (path / 'gone.conf').write_text('some content')
+    watcher = watch.PollWatcher(str(path).encode(), 1, 0.1)
+    events = watcher.event_gen()
+    assert next(events) is None
+    assert clock[0] == pytest.approx(0.1)
+    (path / 'some.conf').write_text('changed content')
+    (path / 'new.conf').write_text('new content')
+    os.unlink(path / 'gone.conf')
+    while clock[0] < 0.95:
+        assert next(events) is None
+    changes = set()
+    for event in iter(lambda: next(events), None):
+        header, typeNames, watchPath, filename = event
+        assert watchPath == str(path).encode()
+        changes.add((typeNames[0], filename))
+    assert clock[0] == pytest.approx(1)
+    assert changes == {
+        ('IN_CLOSE_WRITE', b'some.conf'),
+        ('IN_CLOSE_WRITE', b'new.conf'),
+        ('IN_DELETE', b'gone.conf')}
+
+
+def test_polled_changes_are_batched_without_delay(tmpdir, clock):
+    path = Path(tmpdir)
+    (path / 'some.conf').write_text('some content')
+    watchman = watch.Watchman(path / 'i3configger.json', pollInterval=1)
+    watcher = watchman._get_watcher()
+    assert isinstance(watcher, watch.PollWatcher)
+    watchman._get_watcher = lambda: watcher
+    (path / 'some.conf').write_text('changed content')
+    assert next(watchman._get_event_batches()) == {b'some.conf'}
+    assert clock[0] <= 1 + 2 * watch.Watchman.BUILD_DELAY
+
+
+def test_poll_watcher_ignores_vanishing_files(tmpdir, monkeypatch):
+    path = Path(tmpdir)
+    (path / 'some.conf').write_text('some content')
+    (path / '4913').write_text('')
+    realScandir = os.scandir
+
+    class VanishingEntry:
+        def __init__(self, entry):
+            self.entry = entry
+            self.name = entry.name
+
+        def is_file(self):
+            return True
+
+        def stat(self):
+            if self.name == b'4913':
+                raise FileNotFoundError(self.name)
+            return self.entry.stat()
+
+    class FakeScandir:
+        def __init__(self, path):
+            self.scandir = realScandir(path)
+
+        def __enter__(self):
+            return (VanishingEntry(e) for e in self.scandir)
+
+        def __exit__(self, *args):
+            self.scandir.close()
+
+    monkeypatch.setattr(watch.os, 'scandir', FakeScandir)
+    watcher = watch.PollWatcher(str(path).encode(), 1)
+    assert list(watcher.stamps) == [b'some.conf']
+
+
+@pytest.mark.parametrize("interval", (0, -1))
+def test_poll_watcher_needs_positive_interval(tmpdir, interval):
+    with pytest.raises(exc.ConfigError):
+        watch.PollWatcher(str(tmpdir).encode(), interval)
+
+
+@pytest.mark.parametrize(
+    "path, exp", (
+        ('/home/me/.i3/config.d', False),
+        ('/mnt/nfs/i3/config.d', True),
+        ('/mnt/nfs-not', False),
+        ('/mnt/my share/config.d', True),
+        ('/mnt/sshfs/i3', True),
+    )
+)
+def test_is_on_network_fs(tmpdir, monkeypatch, path, exp):
+    mounts = Path(tmpdir) / 'mounts'
+    mounts.write_text(
+        "/dev/sda1 / ext4 rw,relatime 0 0\n"
+        "/dev/sda2 /home ext4 rw,relatime 0 0\n"
+        "server:/export /mnt/nfs nfs4 rw,relatime 0 0\n"
+        "//server/share /mnt/my\\040share cifs rw 0 0\n"
+        "me@server:/ /mnt/sshfs fuse.sshfs rw 0 0\n")
+    monkeypatch.setattr(watch, 'MOUNTS_PATH', str(mounts))
+    assert watch.is_on_network_fs(Path(path)) is exp